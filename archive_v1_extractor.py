@@ -1,23 +1,25 @@
 #!/usr/bin/env python3
 
-import json
+import io
 from pathlib import Path
 from collections import defaultdict
 
-class ArchonQuestExtractor:
-    def __init__(self, data_dir='GenshinScripts/data'):
-        self.data_dir = Path(data_dir)
-        self.excel_dir = self.data_dir / 'Excel'
-        self.textmap_path = self.data_dir / 'TextMap' / 'TextMapCHS.json'
+from extractor_base import ArchonQuestExtractorBase
+
+class ArchonQuestExtractor(ArchonQuestExtractorBase):
+    DIALOG_ID_PREFIXES = (6, 1, 2, 3, 4, 5, 7, 8, 9)  # any digit; '0' would give the id itself
+    
+    def __init__(self, data_dir='GenshinScripts/data', use_cache=True):
+        super().__init__(data_dir, textmap_lang='CHS', use_cache=use_cache)
         
         print("Loading data files...")
-        self.textmap = self.load_json(self.textmap_path)
-        self.chapters = self.load_json(self.excel_dir / 'ChapterExcelConfigData.json')
-        self.main_quests = self.load_json(self.excel_dir / 'MainQuestExcelConfigData.json')
-        self.quests = self.load_json(self.excel_dir / 'QuestExcelConfigData.json')
-        self.talks = self.load_json(self.excel_dir / 'TalkExcelConfigData.json')
-        self.dialogs = self.load_json(self.excel_dir / 'DialogExcelConfigData.json')
-        self.npcs = self.load_json(self.excel_dir / 'NpcExcelConfigData.json')
+        self.load_textmap()
+        self.chapters = self._cached_load(self.excel_dir / 'ChapterExcelConfigData.json')
+        self.main_quests = self._cached_load(self.excel_dir / 'MainQuestExcelConfigData.json')
+        self.quests = self._cached_load(self.excel_dir / 'QuestExcelConfigData.json')
+        self.talks = self._cached_load(self.excel_dir / 'TalkExcelConfigData.json')
+        self.dialogs = self._cached_load(self.excel_dir / 'DialogExcelConfigData.json')
+        self.npcs = self._cached_load(self.excel_dir / 'NpcExcelConfigData.json')
         
         self.talk_dict = {t['id']: t for t in self.talks if 'id' in t}
         self.dialog_dict = {}
@@ -26,77 +28,62 @@ class ArchonQuestExtractor:
             if dialog_id:
                 self.dialog_dict[dialog_id] = d
         self.npc_dict = {n['id']: n for n in self.npcs if 'id' in n}
+        self.npc_name_by_id = {npc_id: self.get_text(npc.get('nameTextMapHash')) for npc_id, npc in self.npc_dict.items()}
+        
+        self.quests_by_chapter = defaultdict(list)
+        for mq in self.main_quests:
+            chapter_id = mq.get('chapterId')
+            if chapter_id is not None:
+                self.quests_by_chapter[chapter_id].append(mq)
+        self.talks_by_quest = defaultdict(list)
+        for t in self.talks:
+            quest_id = t.get('questId')
+            talk_id = t.get('id')
+            if quest_id and talk_id:
+                self.talks_by_quest[quest_id].append(talk_id)
         
         print(f"Loaded: {len(self.chapters)} chapters, {len(self.main_quests)} main quests, {len(self.dialogs)} dialogs")
     
-    def load_json(self, filepath):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading {filepath}: {e}")
-            return []
-    
-    def get_text(self, hash_value):
-        if not hash_value:
-            return ""
-        return self.textmap.get(str(hash_value), f"[Missing:{hash_value}]")
-    
     def get_archon_chapters(self):
         return [ch for ch in self.chapters if ch.get('questType') == 'AQ']
     
     def get_chapter_quests(self, chapter_id):
-        return [mq for mq in self.main_quests if mq.get('chapterId') == chapter_id]
+        return self.quests_by_chapter.get(chapter_id, [])
     
     def get_quest_talks(self, main_quest_id):
-        return [t['id'] for t in self.talks if t.get('questId') == main_quest_id and t.get('id')]
+        return self.talks_by_quest.get(main_quest_id, [])
     
-    def find_dialog_id(self, init_dialog_id):
-        """Maps Talk.initDialog to DialogExcelConfigData.GFLDJMJKIKE.
-        Newer game versions require a digit prefix (usually '6') to the initDialog ID."""
-        if init_dialog_id in self.dialog_dict:
-            return init_dialog_id
-        
-        for prefix in '0123456789':
-            candidate = int(prefix + str(init_dialog_id))
-            if candidate in self.dialog_dict:
-                return candidate
-        
-        return None
+    def resolve_speaker(self, role_type, role_id):
+        if role_type == 'TALK_ROLE_PLAYER':
+            return "旅行者"
+        if role_type == 'TALK_ROLE_NPC' and role_id:
+            try:
+                return self.npc_name_by_id.get(int(role_id), "旁白")
+            except (TypeError, ValueError):
+                return "旁白"
+        return "旁白"
     
-    def extract_dialog_tree(self, dialog_id, visited=None):
-        if visited is None:
-            visited = set()
-        
-        real_dialog_id = self.find_dialog_id(dialog_id)
-        if real_dialog_id is None or real_dialog_id in visited:
-            return []
-        
-        visited.add(real_dialog_id)
-        dialog = self.dialog_dict[real_dialog_id]
-        
-        role_name = "旁白"
-        role_info = dialog.get('talkRole', {})
-        if role_info.get('type') == 'TALK_ROLE_NPC' and role_info.get('id'):
-            npc_id = int(role_info['id'])
-            if npc_id in self.npc_dict:
-                npc = self.npc_dict[npc_id]
-                role_name = self.get_text(npc.get('nameTextMapHash'))
-        elif role_info.get('type') == 'TALK_ROLE_PLAYER':
-            role_name = "旅行者"
-        
-        content = self.get_text(dialog.get('talkContentTextMapHash'))
-        
+    def extract_dialog_tree(self, dialog_id, visited):
+        """Depth-first walk over nextDialogs using an explicit stack (no recursion limit).
+        `visited` is shared by all talks of a quest so overlapping subtrees are walked once."""
         result = []
-        if content:
-            result.append({'speaker': role_name, 'content': content, 'id': real_dialog_id})
-        
-        next_dialogs = dialog.get('nextDialogs', [])
-        for next_id in next_dialogs:
-            if next_id:
-                next_real_id = self.find_dialog_id(next_id)
-                if next_real_id and next_real_id not in visited:
-                    result.extend(self.extract_dialog_tree(next_id, visited))
+        stack = [dialog_id]
+        while stack:
+            real_dialog_id = self.find_dialog_id(stack.pop())
+            if real_dialog_id is None or real_dialog_id in visited:
+                continue
+            
+            visited.add(real_dialog_id)
+            dialog = self.dialog_dict[real_dialog_id]
+            
+            content = self.get_text(dialog.get('talkContentTextMapHash'))
+            if content:
+                result.append({'speaker': self.get_speaker_name(dialog), 'content': content, 'id': real_dialog_id})
+            
+            # Push in reverse so children are visited left-to-right, as in the recursive order
+            for next_id in reversed(dialog.get('nextDialogs', [])):
+                if next_id:
+                    stack.append(next_id)
         
         return result
     
@@ -114,12 +101,14 @@ class ArchonQuestExtractor:
         print(f"Extracting: {chapter_num} - {chapter_title} [{chapter_id}]")
         print(f"{'='*60}")
         
-        output = []
-        output.append(f"{'='*60}")
-        output.append(f"{chapter_num}")
-        output.append(f"{chapter_title}")
-        output.append(f"Chapter ID: {chapter_id}")
-        output.append(f"{'='*60}\n")
+        # One growing buffer instead of a list of lines joined at the end
+        buf = io.StringIO()
+        w = buf.write
+        w('=' * 60)
+        w(f"\n{chapter_num}")
+        w(f"\n{chapter_title}")
+        w(f"\nChapter ID: {chapter_id}")
+        w(f"\n{'='*60}\n")
         
         quests = self.get_chapter_quests(chapter_id)
         print(f"Found {len(quests)} main quests")
@@ -128,13 +117,14 @@ class ArchonQuestExtractor:
             mq_title = self.get_text(mq.get('titleTextMapHash'))
             mq_desc = self.get_text(mq.get('descTextMapHash'))
             
-            output.append(f"\n{'─'*60}")
-            output.append(f"【主线任务】{mq_title} (ID: {mq.get('id')})")
+            w(f"\n\n{'─'*60}")
+            w(f"\n【主线任务】{mq_title} (ID: {mq.get('id')})")
             if mq_desc:
-                output.append(f"任务描述：{mq_desc}")
-            output.append(f"{'─'*60}\n")
+                w(f"\n任务描述：{mq_desc}")
+            w(f"\n{'─'*60}\n")
             
             talk_ids = self.get_quest_talks(mq.get('id'))
+            visited = set()
             print(f"  Quest {mq.get('id')}: {mq_title} - {len(talk_ids)} talks")
             
             for talk_id in talk_ids:
@@ -145,14 +135,17 @@ class ArchonQuestExtractor:
                 init_dialog = talk.get('initDialog')
                 
                 if init_dialog:
-                    dialogs = self.extract_dialog_tree(init_dialog)
-                    for i, dlg in enumerate(dialogs, 1):
-                        output.append(f"{dlg['speaker']}：{dlg['content']}")
+                    dialogs = self.extract_dialog_tree(init_dialog, visited)
+                    for dlg in dialogs:
+                        w('\n')
+                        w(dlg['speaker'])
+                        w('：')
+                        w(dlg['content'])
                     
                     if dialogs:
-                        output.append("")
+                        w('\n')
         
-        return '\n'.join(output)
+        return buf.getvalue()
     
     def extract_all_archon_quests(self, chapter_ids, output_dir='output'):
         output_path = Path(output_dir)
@@ -164,14 +157,17 @@ class ArchonQuestExtractor:
             content = self.extract_chapter(chapter_id)
             if content:
                 filepath = output_path / f"Chapter_{chapter_id}.txt"
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                filepath.write_text(content, encoding='utf-8')
                 print(f"✓ Saved to {filepath}")
                 all_content.append(content)
         
         combined_path = output_path / "ArchonQuest_CHS_AllInOne.txt"
-        with open(combined_path, 'w', encoding='utf-8') as f:
-            f.write('\n\n'.join(all_content))
+        # Stream the chapters instead of joining them into one more giant string
+        with open(combined_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for i, content in enumerate(all_content):
+                if i:
+                    f.write('\n\n')
+                f.write(content)
         print(f"\n✓ Combined file saved to {combined_path}")
         
         return combined_path
@@ -7,119 +7,184 @@ Combines two extraction methods:
 """
 
 import argparse
+import functools
+import io
 import json
+import multiprocessing
 import os
 import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 
-class ArchonQuestExtractorV2:
-    def __init__(self, data_dir='GenshinScripts/data', repo_dir='AnimeGameData', textmap_lang='CHS'):
-        self.data_dir = Path(data_dir)
+from extractor_base import ArchonQuestExtractorBase, orjson
+
+# Obfuscated CodexQuest field names
+_CODEX_SECTIONS = 'GFLHMKOOHHA'   # main dialogue sections
+_CODEX_NODES = 'JKNIDKEDDMB'      # nodes of a section
+_CODEX_SPEAKER = 'LKJMACGGCNI'    # node speaker
+_CODEX_LINES = 'IINLCABCIDE'      # dialogue entries of a node
+_CODEX_DIALOG_ID = 'GEJLBGLBCOO'  # dialogue entry id
+_CODEX_TEXT = 'GLMJHDNIGID'       # dialogue entry text
+_CODEX_HASH = 'MANCOJCEIMH'       # textmap hash inside speaker/text
+
+# Extractor shared with forked worker processes (inherited copy-on-write, never pickled)
+_WORKER_EXTRACTOR = None
+
+
+def _silence_worker_output():
+    # Per-chapter/per-quest progress from several workers would interleave; the parent reports instead
+    sys.stdout = open(os.devnull, 'w')
+
+
+def _extract_chapter_worker(chapter):
+    return _WORKER_EXTRACTOR.extract_chapter(chapter)
+
+
+class ArchonQuestExtractorV2(ArchonQuestExtractorBase):
+    def __init__(self, data_dir='GenshinScripts/data', repo_dir='AnimeGameData', textmap_lang='CHS', use_cache=True):
+        super().__init__(data_dir, textmap_lang=textmap_lang, use_cache=use_cache)
         self.repo_dir = Path(repo_dir)
-        self.excel_dir = self.data_dir / 'Excel'
-        self.textmap_path = self.data_dir / 'TextMap' / f'TextMap{textmap_lang}.json'
         self.codex_dir = self.repo_dir / 'BinOutput' / 'CodexQuest'
+        # One directory listing instead of a stat() per quest
+        self.codex_ids = {
+            int(p.stem) for p in self.codex_dir.glob('*.json') if p.stem.isdigit()
+        } if self.codex_dir.exists() else set()
 
         print("Loading data files...")
-        self.textmap = self.load_json(self.textmap_path)
-        self.chapters = self.load_json(self.excel_dir / 'ChapterExcelConfigData.json')
-        self.main_quests = self.load_json(self.excel_dir / 'MainQuestExcelConfigData.json')
-        self.quests = self.load_json(self.excel_dir / 'QuestExcelConfigData.json')
-        self.talks = self.load_json(self.excel_dir / 'TalkExcelConfigData.json')
-        self.dialogs = self.load_json(self.excel_dir / 'DialogExcelConfigData.json')
-        self.npcs = self.load_json(self.excel_dir / 'NpcExcelConfigData.json')
+        self.load_textmap()
+        self.chapters = self._cached_load(self.excel_dir / 'ChapterExcelConfigData.json')
+        self.main_quests = self._cached_load(self.excel_dir / 'MainQuestExcelConfigData.json')
+        self.quests = self._cached_load(self.excel_dir / 'QuestExcelConfigData.json')
+        self.talks = self._cached_load(self.excel_dir / 'TalkExcelConfigData.json')
+        # dialogs/npcs (and their lookups) load lazily on the first DialogTree fallback
+
+        # Validate shapes once so lookups below can trust the data
+        self.chapters = self.dict_rows(self.chapters)
+        self.main_quests = self.dict_rows(self.main_quests)
+        self.talks = self.dict_rows(self.talks)
 
         # Build lookup dicts
-        self.talk_dict = {t['id']: t for t in self.talks if isinstance(t, dict) and 'id' in t}
-        self.dialog_dict = {}
-        for d in self.dialogs:
-            if not isinstance(d, dict):
-                continue
-            dialog_id = d.get('GFLDJMJKIKE') or d.get('id')
-            if dialog_id:
-                self.dialog_dict[dialog_id] = d
-        self.npc_dict = {n['id']: n for n in self.npcs if isinstance(n, dict) and 'id' in n}
+        self.talk_dict = {t['id']: t for t in self.talks if 'id' in t}
 
         # Build main quest lookup
-        self.main_quest_dict = {mq['id']: mq for mq in self.main_quests if isinstance(mq, dict) and 'id' in mq}
+        self.main_quest_dict = {mq['id']: mq for mq in self.main_quests if 'id' in mq}
 
-        print(f"Loaded: {len(self.chapters)} chapters, {len(self.main_quests)} main quests, {len(self.dialogs)} dialogs")
-        print(f"CodexQuest dir: {self.codex_dir}")
+        # Build per-chapter / per-quest indexes (avoid rescanning lists per call)
+        self.quests_by_chapter = defaultdict(list)
+        for mq in self.main_quests:
+            for chapter_id in {mq.get('series'), mq.get('chapterId')}:
+                if chapter_id is not None:
+                    self.quests_by_chapter[chapter_id].append(mq)
+        for quest_list in self.quests_by_chapter.values():
+            quest_list.sort(key=lambda x: x.get('id', 0))
+        self.talks_by_quest = defaultdict(list)
+        for t in self.talks:
+            if t.get('questId'):
+                self.talks_by_quest[t['questId']].append(t)
+
+        print(f"Loaded: {len(self.chapters)} chapters, {len(self.main_quests)} main quests")
+        print(f"CodexQuest dir: {self.codex_dir} ({len(self.codex_ids)} files)")
     
-    def load_json(self, filepath):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading {filepath}: {e}")
-            return []
+    @functools.cached_property
+    def dialogs(self):
+        dialogs = self.dict_rows(self._cached_load(self.excel_dir / 'DialogExcelConfigData.json'))
+        print(f"Loaded: {len(dialogs)} dialogs")
+        return dialogs
     
-    def get_text(self, hash_value):
-        """Convert text hash to actual text"""
-        if not hash_value:
-            return ""
-        if isinstance(self.textmap, dict):
-            return self.textmap.get(str(hash_value), f"[Missing:{hash_value}]")
-        return f"[Missing:{hash_value}]"
+    @functools.cached_property
+    def dialog_dict(self):
+        dialog_dict = {}
+        for d in self.dialogs:
+            dialog_id = d.get('GFLDJMJKIKE') or d.get('id')
+            if dialog_id:
+                dialog_dict[dialog_id] = d
+        return dialog_dict
+    
+    @functools.cached_property
+    def npcs(self):
+        return self.dict_rows(self._cached_load(self.excel_dir / 'NpcExcelConfigData.json'))
+    
+    @functools.cached_property
+    def npc_dict(self):
+        return {n['id']: n for n in self.npcs if 'id' in n}
+    
+    @functools.cached_property
+    def npc_name_by_id(self):
+        return {
+            npc_id: self.get_text(npc['nameTextMapHash'])
+            for npc_id, npc in self.npc_dict.items()
+            if npc.get('nameTextMapHash')
+        }
+    
+    def needs_dialog_tree(self, chapters):
+        """Whether any main quest of these chapters has no CodexQuest file"""
+        return any(
+            mq.get('id', 0) not in self.codex_ids
+            for chapter in chapters
+            for mq in self.get_chapter_main_quests(chapter.get('id', 0))
+        )
     
     def get_archon_chapters(self):
         """Get all Archon Quest chapters"""
-        chapters = [ch for ch in self.chapters if isinstance(ch, dict) and ch.get('questType') == 'AQ']
+        chapters = [ch for ch in self.chapters if ch.get('questType') == 'AQ']
         return sorted(chapters, key=lambda x: x.get('id', 0))
     
     def get_chapter_main_quests(self, chapter_id):
         """Get main quests for a chapter using series or chapterId field"""
-        return sorted([mq for mq in self.main_quests 
-                      if mq.get('series') == chapter_id or mq.get('chapterId') == chapter_id],
-                     key=lambda x: x.get('id', 0))
+        return self.quests_by_chapter.get(chapter_id, [])
     
     def extract_from_codexquest(self, quest_id):
         """Extract dialogues from CodexQuest file"""
-        codex_file = self.codex_dir / f"{quest_id}.json"
-        
-        if not codex_file.exists():
+        if quest_id not in self.codex_ids:
             return None
         
+        codex_file = self.codex_dir / f"{quest_id}.json"
+        
         try:
-            with open(codex_file, 'r', encoding='utf-8') as f:
-                quest_data = json.load(f)
+            with open(codex_file, 'rb') as f:
+                data = f.read()
+            quest_data = self.parse_json_bytes(data)
         except Exception as e:
             print(f"  Error loading CodexQuest {quest_id}: {e}")
             return None
         
         dialogues = []
+        append = dialogues.append
+        get_text = self.get_text
         
-        # GFLHMKOOHHA contains main dialogue sections
-        if 'GFLHMKOOHHA' in quest_data:
-            sections = quest_data['GFLHMKOOHHA']
+        for section in quest_data.get(_CODEX_SECTIONS, ()):
+            if _CODEX_NODES not in section:
+                continue
             
-            for section in sections:
-                if 'JKNIDKEDDMB' in section:
-                    nodes = section['JKNIDKEDDMB']
+            for node in section[_CODEX_NODES]:
+                # Direct indexing: most nodes have the fields, and .get(..., {}) allocates per node
+                try:
+                    speaker_hash = node[_CODEX_SPEAKER][_CODEX_HASH]
+                except KeyError:
+                    speaker_hash = 0
+                speaker = get_text(speaker_hash) if speaker_hash else '旁白'
+                
+                if speaker.startswith('[') or not speaker:
+                    speaker = '旁白'
+                
+                if _CODEX_LINES not in node:
+                    continue
+                
+                for dialog_entry in node[_CODEX_LINES]:
+                    try:
+                        text_hash = dialog_entry[_CODEX_TEXT][_CODEX_HASH]
+                    except KeyError:
+                        continue
                     
-                    for node in nodes:
-                        speaker_data = node.get('LKJMACGGCNI', {})
-                        speaker_hash = speaker_data.get('MANCOJCEIMH', 0)
-                        speaker = self.get_text(speaker_hash) if speaker_hash else '旁白'
-                        
-                        if speaker.startswith('[') or not speaker:
-                            speaker = '旁白'
-                        
-                        if 'IINLCABCIDE' in node:
-                            for dialog_entry in node['IINLCABCIDE']:
-                                dialog_id = dialog_entry.get('GEJLBGLBCOO', 0)
-                                text_data = dialog_entry.get('GLMJHDNIGID', {})
-                                text_hash = text_data.get('MANCOJCEIMH', 0)
-                                
-                                if text_hash:
-                                    text = self.get_text(text_hash)
-                                    dialogues.append({
-                                        'id': dialog_id,
-                                        'text': text,
-                                        'speaker': speaker
-                                    })
+                    if text_hash:
+                        append({
+                            'id': dialog_entry.get(_CODEX_DIALOG_ID, 0),
+                            'text': get_text(text_hash),
+                            'speaker': speaker
+                        })
         
         return dialogues if dialogues else None
     
@@ -135,85 +200,73 @@ class ArchonQuestExtractorV2:
     def extract_from_dialog_tree(self, quest_id):
         """Extract dialogues using old method (DialogExcelConfigData)"""
         # Find talk configs for this quest
-        quest_talks = [t for t in self.talks if t.get('questId') == quest_id]
+        quest_talks = self.talks_by_quest.get(quest_id, [])
         
         if not quest_talks:
             return None
         
         dialogues = []
+        visited = set()  # shared so talks with overlapping dialog subtrees are walked once
         
         for talk in quest_talks:
             init_dialog = talk.get('initDialog', 0)
             
             if init_dialog:
-                # Try to find dialog with ID prefix variants
-                dialog_ids_to_try = [
-                    init_dialog,
-                    int(f"6{init_dialog}"),  # Newer versions use prefix '6'
-                ]
-                
-                for dialog_id in dialog_ids_to_try:
-                    if dialog_id in self.dialog_dict:
-                        talk_dialogues = self.extract_dialog_tree(dialog_id)
-                        dialogues.extend(talk_dialogues)
-                        break
+                dialog_id = self.find_dialog_id(init_dialog)
+                if dialog_id is not None:
+                    dialogues.extend(self.extract_dialog_tree(dialog_id, visited))
         
         return dialogues if dialogues else None
     
-    def extract_dialog_tree(self, dialog_id, visited=None):
-        """Recursively extract dialogue tree"""
-        if visited is None:
-            visited = set()
-        
-        if dialog_id in visited:
-            return []
-        
-        visited.add(dialog_id)
-        
-        dialog = self.dialog_dict.get(dialog_id)
-        if not dialog:
-            return []
-        
+    def extract_dialog_tree(self, dialog_id, visited):
+        """Extract dialogue tree (iterative DFS, same order as the recursive walk).
+        `visited` is shared across the talks of a quest"""
         dialogues = []
+        stack = [dialog_id]
         
-        # Get current dialogue
-        text_hash = dialog.get('talkContentTextMapHash', 0)
-        if text_hash:
-            text = self.get_text(text_hash)
-            speaker = self.get_speaker_name(dialog)
+        while stack:
+            dialog_id = stack.pop()
+            if dialog_id in visited:
+                continue
+            visited.add(dialog_id)
             
-            dialogues.append({
-                'id': dialog_id,
-                'speaker': speaker,
-                'text': text
-            })
-        
-        # Follow next dialogs
-        next_dialogs = dialog.get('nextDialogs', [])
-        for next_id in next_dialogs:
-            dialogues.extend(self.extract_dialog_tree(next_id, visited))
+            dialog = self.dialog_dict.get(dialog_id)
+            if not dialog:
+                continue
+            
+            # Get current dialogue
+            text_hash = dialog.get('talkContentTextMapHash', 0)
+            if text_hash:
+                dialogues.append({
+                    'id': dialog_id,
+                    'speaker': self.get_speaker_name(dialog),
+                    'text': self.get_text(text_hash)
+                })
+            
+            # Follow next dialogs (pushed reversed to keep left-to-right order)
+            next_dialogs = dialog.get('nextDialogs', [])
+            stack.extend(reversed(next_dialogs))
         
         return dialogues
     
-    def get_speaker_name(self, dialog):
-        """Get speaker name from dialog"""
-        talk_role = dialog.get('talkRole', {})
-        role_type = talk_role.get('type', '')
-        
+    def resolve_speaker(self, role_type, role_id):
+        """Speaker name for a talkRole; unknown NPC ids give '未知'"""
         if role_type == 'TALK_ROLE_PLAYER':
             return '旅行者'
         
-        role_id = talk_role.get('id', 0)
-        if role_id:
-            npc = self.npc_dict.get(role_id, {})
-            name_hash = npc.get('nameTextMapHash', 0)
-            if name_hash:
-                return self.get_text(name_hash)
+        # Only NPC roles map to NpcExcelConfigData; talkRole ids are strings there, NPC ids ints
+        if role_type == 'TALK_ROLE_NPC' and role_id:
+            try:
+                return self.npc_name_by_id.get(int(role_id), '未知')
+            except (TypeError, ValueError):
+                return '未知'
         
-        return '未知'
+        return '旁白'
     
     def extract_chapter(self, chapter):
-        """Extract all dialogues for a chapter using hybrid approach"""
+        """Extract all dialogues for a chapter using hybrid approach.
+        Returns (content, dialogue_offsets, missing_count): dialogue_offsets are the start
+        positions of the dialogue lines in content; content is None if nothing was extracted"""
         chapter_id = chapter.get('id', 0)
         chapter_num_hash = chapter.get('chapterNumTextMapHash', 0)
         chapter_title_hash = chapter.get('chapterTitleTextMapHash', 0)
@@ -230,15 +283,35 @@ class ArchonQuestExtractorV2:
         
         if not main_quests:
             print(f"  No main quests found for chapter {chapter_id}")
-            return None
+            return None, [], 0
+        
+        # Write straight into one buffer; coverage stats are tallied as lines are written
+        buf = io.StringIO()
+        w = buf.write
+        dialogue_offsets = []
+        missing_count = 0
+        # Characters written so far; StringIO.tell() is an opaque cookie, not a str index
+        position = 0
         
-        chapter_output = []
-        chapter_output.append("=" * 60)
-        chapter_output.append(chapter_num)
-        chapter_output.append(chapter_title)
-        chapter_output.append(f"Chapter ID: {chapter_id}")
-        chapter_output.append("=" * 60)
-        chapter_output.append("")
+        def write_line(line):
+            nonlocal missing_count, position
+            w("\n")
+            position += 1
+            if "：" in line and line.strip():
+                dialogue_offsets.append(position)
+            if "[Missing:" in line:
+                missing_count += 1
+            w(line)
+            position += len(line)
+        
+        w("=" * 60)
+        position = 60
+        write_line(chapter_num)
+        write_line(chapter_title)
+        write_line(f"Chapter ID: {chapter_id}")
+        write_line("=" * 60)
+        write_line("")
+        has_quests = False
         
         for main_quest in main_quests:
             quest_id = main_quest.get('id', 0)
@@ -261,27 +334,78 @@ class ArchonQuestExtractorV2:
             
             if dialogues:
                 print(f"    Extracted {len(dialogues)} dialogues ({extraction_method})")
+                has_quests = True
                 
-                chapter_output.append("─" * 60)
-                chapter_output.append(f"【主线任务】{quest_title} (ID: {quest_id})")
+                write_line("─" * 60)
+                write_line(f"【主线任务】{quest_title} (ID: {quest_id})")
                 if quest_desc:
-                    chapter_output.append(f"任务描述：{quest_desc}")
-                chapter_output.append("─" * 60)
-                chapter_output.append("")
+                    write_line(f"任务描述：{quest_desc}")
+                write_line("─" * 60)
+                write_line("")
                 
                 for dlg in dialogues:
                     speaker = dlg.get('speaker', '未知')
                     text = dlg.get('text', '')
                     if text:
-                        chapter_output.append(f"{speaker}：{text}")
+                        w("\n")
+                        dialogue_offsets.append(position + 1)
+                        w(speaker)
+                        w("：")
+                        w(text)
+                        position += 2 + len(speaker) + len(text)
+                        if "[Missing:" in text or "[Missing:" in speaker:
+                            missing_count += 1
                 
-                chapter_output.append("")
+                write_line("")
             else:
                 print(f"    No dialogues extracted")
         
-        return "\n".join(chapter_output) if len(chapter_output) > 7 else None
+        if not has_quests:
+            return None, [], 0
+        
+        return buf.getvalue(), dialogue_offsets, missing_count
     
-    def extract_all(self, output_dir='output_v2', chapters=None, merge_all=True, write_text=True, validation_only=False, sample_count=20, seed=None):
+    def iter_extracted_chapters(self, chapters, workers=1):
+        """Yield (chapter, extract_chapter result) in chapter order, extracting in forked worker processes if possible"""
+        global _WORKER_EXTRACTOR
+        workers = min(workers or 1, len(chapters))
+        if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            for chapter in chapters:
+                yield chapter, self.extract_chapter(chapter)
+            return
+
+        # Load the DialogTree data once here rather than once per worker
+        if self.needs_dialog_tree(chapters):
+            _ = self.dialog_dict, self.npc_name_by_id
+        
+        # Workers fork here, before the caller submits any write (so before writer threads
+        # exist) and with no pending stdout. Pool only re-forks if a worker dies, and a
+        # killed worker (e.g. OOM) stalls imap, which is why parallelism is opt-in.
+        sys.stdout.flush()
+        _WORKER_EXTRACTOR = self
+        try:
+            with multiprocessing.get_context('fork').Pool(processes=workers, initializer=_silence_worker_output) as pool:
+                for chapter, result in zip(chapters, pool.imap(_extract_chapter_worker, chapters)):
+                    print(f"[worker] Chapter {chapter.get('id', 0)} extracted")
+                    yield chapter, result
+        finally:
+            _WORKER_EXTRACTOR = None
+    
+    @staticmethod
+    def line_at(content, start):
+        """The line of content beginning at offset start"""
+        end = content.find("\n", start)
+        return content[start:] if end == -1 else content[start:end]
+    
+    def write_all_in_one(self, path, contents):
+        """Write chapter contents to one file, streamed instead of joined in memory"""
+        with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for i, content in enumerate(contents):
+                if i:
+                    f.write("\n\n")
+                f.write(content)
+    
+    def extract_all(self, output_dir='output_v2', chapters=None, merge_all=True, write_text=True, validation_only=False, sample_count=20, seed=None, workers=1):
         """Extract all Archon Quest dialogues"""
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
@@ -306,68 +430,78 @@ class ArchonQuestExtractorV2:
             "chapters": []
         }
         sample_lines = []
+        seen_lines = 0
 
         rng = random.Random(seed) if seed is not None else random
 
-        for chapter in archon_chapters:
-            chapter_id = chapter.get('id', 0)
-            content = self.extract_chapter(chapter)
+        # File writes are I/O-bound; overlap them with extraction of the next chapter
+        pending_writes = []
+        write_merged = write_text and merge_all and not validation_only
+        all_in_one = output_path / "ArchonQuest_CHS_AllInOne.txt"
 
-            if not content:
-                continue
+        with ThreadPoolExecutor(max_workers=4) as writer:
+            for chapter, (content, dialogue_offsets, missing_count) in self.iter_extracted_chapters(archon_chapters, workers):
+                chapter_id = chapter.get('id', 0)
+
+                if not content:
+                    continue
 
-            lines = [line for line in content.split("\n") if line.strip()]
-            dialogue_lines = [line for line in lines if "：" in line]
-            missing_count = sum(1 for line in lines if "[Missing:" in line)
-
-            coverage["chapters"].append({
-                "id": str(chapter_id),
-                "dialogues": len(dialogue_lines),
-                "missing_texts": missing_count
-            })
-            coverage["summary"]["total_chapters"] += 1
-            coverage["summary"]["total_dialogues"] += len(dialogue_lines)
-            coverage["summary"]["total_missing_texts"] += missing_count
-
-            if write_text and not validation_only:
-                chapter_file = output_path / f"Chapter_{chapter_id}.txt"
-                with open(chapter_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-
-                all_content.append(content)
-                chapter_count += 1
-
-            if dialogue_lines and sample_count > 0:
-                for idx, line in enumerate(dialogue_lines):
-                    if len(sample_lines) < sample_count:
-                        sample_lines.append({
+                coverage["chapters"].append({
+                    "id": str(chapter_id),
+                    "dialogues": len(dialogue_offsets),
+                    "missing_texts": missing_count
+                })
+                coverage["summary"]["total_chapters"] += 1
+                coverage["summary"]["total_dialogues"] += len(dialogue_offsets)
+                coverage["summary"]["total_missing_texts"] += missing_count
+
+                if write_text and not validation_only:
+                    chapter_file = output_path / f"Chapter_{chapter_id}.txt"
+                    pending_writes.append(writer.submit(chapter_file.write_text, content, encoding='utf-8'))
+
+                    all_content.append(content)
+                    chapter_count += 1
+
+                if dialogue_offsets and sample_count > 0:
+                    # Reservoir sampling (Algorithm R): uniform over all dialogue lines
+                    for idx, start in enumerate(dialogue_offsets):
+                        seen_lines += 1
+                        if len(sample_lines) < sample_count:
+                            slot = len(sample_lines)
+                            sample_lines.append(None)
+                        else:
+                            slot = rng.randrange(seen_lines)
+                            if slot >= sample_count:
+                                continue
+                        sample_lines[slot] = {
                             "chapter_id": str(chapter_id),
                             "line_index": idx,
-                            "text": line
-                        })
-                    else:
-                        if rng.random() < 0.1:
-                            replace_idx = rng.randrange(sample_count)
-                            sample_lines[replace_idx] = {
-                                "chapter_id": str(chapter_id),
-                                "line_index": idx,
-                                "text": line
-                            }
-
-        coverage_report = output_path / "coverage_report.json"
-        with open(coverage_report, 'w', encoding='utf-8') as f:
-            json.dump(coverage, f, ensure_ascii=False, indent=2)
-
-        validation_samples = output_path / "validation_samples.jsonl"
-        with open(validation_samples, 'w', encoding='utf-8') as f:
-            for item in sample_lines:
-                f.write(json.dumps(item, ensure_ascii=False) + "\n")
-
-        if write_text and merge_all and all_content and not validation_only:
-            all_in_one = output_path / "ArchonQuest_CHS_AllInOne.txt"
-            with open(all_in_one, 'w', encoding='utf-8') as f:
-                f.write("\n\n".join(all_content))
+                            "text": self.line_at(content, start)
+                        }
+
+            if write_merged and all_content:
+                pending_writes.append(writer.submit(self.write_all_in_one, all_in_one, all_content))
+
+            # Each report is encoded in memory and written with a single call
+            coverage_report = output_path / "coverage_report.json"
+            validation_samples = output_path / "validation_samples.jsonl"
+            if orjson:
+                coverage_report.write_bytes(
+                    orjson.dumps(coverage, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                )
+                validation_samples.write_bytes(b"".join(orjson.dumps(item) + b"\n" for item in sample_lines))
+            else:
+                coverage_report.write_text(json.dumps(coverage, ensure_ascii=False, indent=2), encoding='utf-8')
+                validation_samples.write_text(
+                    "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in sample_lines),
+                    encoding='utf-8'
+                )
+
+            # Surface any write error
+            for future in pending_writes:
+                future.result()
 
+        if write_merged and all_content:
             print(f"\n{'='*60}")
             print(f"Extraction complete!")
             print(f"Total chapters: {chapter_count}")
@@ -397,6 +531,8 @@ def parse_args():
     parser.add_argument("--validation-only", action="store_true", help="Only generate coverage/sample validation outputs")
     parser.add_argument("--lang", default="CHS", help="TextMap language code, e.g. CHS/CHT/EN")
     parser.add_argument("--sample-count", type=int, default=20, help="Number of validation samples to retain")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the .pkl caches next to the source JSON")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for chapter extraction (default 1 = serial; >1 forks workers, which each touch their own copy of the loaded data)")
     parser.add_argument("--seed", type=int, default=None, help="Random seed for validation sampling")
     return parser.parse_args()
 
@@ -407,7 +543,8 @@ if __name__ == '__main__':
     extractor = ArchonQuestExtractorV2(
         data_dir=args.data_dir,
         repo_dir=args.repo_dir,
-        textmap_lang=args.lang
+        textmap_lang=args.lang,
+        use_cache=not args.no_cache
     )
     extractor.extract_all(
         output_dir=args.output_dir,
@@ -416,5 +553,6 @@ if __name__ == '__main__':
         write_text=not args.no_text_output,
         validation_only=args.validation_only,
         sample_count=args.sample_count,
-        seed=args.seed
+        seed=args.seed,
+        workers=args.workers
     )
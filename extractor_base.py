@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Shared loading and lookup logic for the Archon Quest extractors
+(archon_quest_extractor.py and archive_v1_extractor.py).
+"""
+
+import json
+import os
+import pickle
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to stdlib json
+    orjson = None
+
+_SENTINEL = object()
+
+# Bump when what _cached_load stores changes (e.g. a new postprocess step)
+_CACHE_FORMAT = 2
+
+
+class ArchonQuestExtractorBase(ABC):
+    # Digit prefixes tried (in order) when Talk.initDialog is not a dialog key itself
+    DIALOG_ID_PREFIXES = (6,)
+
+    def __init__(self, data_dir='GenshinScripts/data', textmap_lang='CHS', use_cache=True):
+        self.data_dir = Path(data_dir)
+        self.excel_dir = self.data_dir / 'Excel'
+        self.use_cache = use_cache
+        self.textmap_path = self.data_dir / 'TextMap' / f'TextMap{textmap_lang}.json'
+        self.textmap = {}
+
+        # Per-instance memos (misses included), shared by every quest of a run
+        self._dialog_resolve_cache = {}
+        self._speaker_cache = {}
+
+    def load_textmap(self):
+        self.textmap = self._cached_load(self.textmap_path, postprocess=self.int_keyed_textmap)
+
+    @staticmethod
+    def int_keyed_textmap(textmap):
+        """Excel hashes are ints: key the textmap by int once instead of str() per lookup"""
+        if not isinstance(textmap, dict):
+            return {}
+        return {int(k): v for k, v in textmap.items() if k.isdigit()}
+
+    @staticmethod
+    def parse_json_bytes(data):
+        """Parse a JSON document read as bytes (orjson when installed)"""
+        return orjson.loads(data) if orjson else json.loads(data)
+
+    def load_json(self, filepath):
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            return self.parse_json_bytes(data)
+        except Exception as e:
+            print(f"Error loading {filepath}: {e}")
+            return []
+
+    def _cached_load(self, filepath, postprocess=None):
+        """load_json (then postprocess) with a pickle cache next to the source file.
+        The cache stores the postprocessed value and records the source's (st_size, st_mtime_ns);
+        it is only used on an exact match, so restored/older timestamps invalidate it too."""
+        def parse():
+            data = self.load_json(filepath)
+            return postprocess(data) if postprocess else data
+
+        if not self.use_cache:
+            return parse()
+
+        cache_path = filepath.with_suffix(filepath.suffix + '.pkl')
+        try:
+            source_stat = filepath.stat()
+            stamp = (_CACHE_FORMAT, source_stat.st_size, source_stat.st_mtime_ns)
+        except OSError:
+            return parse()  # load_json reports the missing source
+
+        try:
+            with open(cache_path, 'rb') as f:
+                # Stamp is a separate record so a stale cache is rejected before loading the data
+                if pickle.load(f) == stamp:
+                    return pickle.load(f)
+        except Exception:
+            pass  # missing/corrupt cache: fall back to JSON
+
+        data = parse()
+        if data:
+            tmp_path = cache_path.with_suffix('.tmp')
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(stamp, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except Exception as e:
+                print(f"Could not write cache {cache_path}: {e}")
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+        return data
+
+    @staticmethod
+    def dict_rows(rows):
+        """Keep only the dict rows of an Excel config list"""
+        return [row for row in rows if isinstance(row, dict)]
+
+    def get_text(self, hash_value):
+        """Convert text hash to actual text"""
+        if not hash_value:
+            return ""
+        # Only format the sentinel on a miss; the coverage report counts "[Missing:" lines
+        text = self.textmap.get(hash_value)
+        if text is None and isinstance(hash_value, str) and hash_value.isdigit():
+            text = self.textmap.get(int(hash_value))
+        return text if text is not None else f"[Missing:{hash_value}]"
+
+    def find_dialog_id(self, init_dialog_id):
+        """Maps Talk.initDialog to DialogExcelConfigData.GFLDJMJKIKE (cached).
+        Newer game versions require a digit prefix (usually '6') to the initDialog ID."""
+        resolved = self._dialog_resolve_cache.get(init_dialog_id, _SENTINEL)
+        if resolved is not _SENTINEL:
+            return resolved
+
+        resolved = None
+        if init_dialog_id in self.dialog_dict:
+            resolved = init_dialog_id
+        else:
+            # Prefixing digit p is p * 10**digits + id
+            scale = 10 ** len(str(init_dialog_id))
+            for prefix in self.DIALOG_ID_PREFIXES:
+                candidate = prefix * scale + init_dialog_id
+                if candidate in self.dialog_dict:
+                    resolved = candidate
+                    break
+
+        self._dialog_resolve_cache[init_dialog_id] = resolved
+        return resolved
+
+    def get_speaker_name(self, dialog):
+        """Get speaker name from dialog, memoized per talkRole (type, id)"""
+        talk_role = dialog.get('talkRole', {})
+        key = (talk_role.get('type'), talk_role.get('id'))
+        name = self._speaker_cache.get(key)
+        if name is None:
+            name = self._speaker_cache[key] = self.resolve_speaker(*key)
+        return name
+
+    @abstractmethod
+    def resolve_speaker(self, role_type, role_id):
+        """Speaker name for a talkRole; subclasses define the fallbacks"""